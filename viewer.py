@@ -1,28 +1,64 @@
 #!/usr/bin/env python3
+import contextlib
+import functools
+import gzip
 import json
 import os
+import queue
 import re
+import threading
+import time
 import urllib.parse
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used when orjson is not installed
+    orjson = None
+
 HOST = os.getenv("HOST", "127.0.0.1")
 PORT = int(os.getenv("PORT", "8767"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", str(min(32, (os.cpu_count() or 4) * 4))))
+HTTP_REQUEST_TIMEOUT = 30.0
 MAX_LIST = 400
 MAX_EVENTS = 4000
 MAX_DESKTOP_SCAN_BYTES = 2 * 1024 * 1024
+DESKTOP_BLOB_BUFFER_BYTES = 256 * 1024
+SUMMARY_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+SUMMARY_CACHE_SIZE = 4096
+ROOTS_CACHE_TTL = 30.0
+NDJSON_FLUSH_LINES = 50
+LIST_SNAPSHOTS = 16
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 1
+
+_TS_DIGITS_RE = re.compile(r"\d{10,16}", re.ASCII)
+_WSL_PATH_RE = re.compile(r"^/mnt/([a-zA-Z])/(.*)$")
+_SLUG_WIN_RE = re.compile(r"^([a-zA-Z]:)\\-([^\\]+)$")
+_READABLE_RE = re.compile(r"[ -~\u3040-\u30FF\u4E00-\u9FFF]{24,300}")
+_JSON_STRUCTURAL_RE = re.compile(r'[{}"]')
+_JSON_STRING_SPECIAL_RE = re.compile(r'["\\]')
+# The quoted keys _extract_json_objects_from_text requires, as UTF-16LE bytes.
+_UTF16LE_JSON_KEY_RE = re.compile(
+    b"|".join(re.escape(f'"{k}"'.encode("utf-16le")) for k in ("text", "content", "prompt", "message"))
+)
+
+_json_decode = json.JSONDecoder().decode
+_json_dumps = json.JSONEncoder(ensure_ascii=False).encode
+_json_dumps_compact = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+_summary_executor = ThreadPoolExecutor(max_workers=SUMMARY_WORKERS, thread_name_prefix="summarize")
 
 
 def _unique_paths(paths):
-    out = []
-    seen = set()
+    seen = {}
     for p in paths:
-        key = str(p)
-        if key not in seen:
-            seen.add(key)
-            out.append(p)
-    return out
+        seen.setdefault(os.fspath(p), p)
+    return list(seen.values())
 
 
 def _path_exists_safe(path: Path) -> bool:
@@ -32,6 +68,25 @@ def _path_exists_safe(path: Path) -> bool:
         return False
 
 
+@functools.lru_cache(maxsize=None)
+def _windows_user_dirs():
+    users_root = Path("/mnt/c/Users")
+    if not _path_exists_safe(users_root):
+        return ()
+    try:
+        dirs = list(users_root.iterdir())
+    except Exception:
+        return ()
+    out = []
+    for d in dirs:
+        try:
+            if d.is_dir():
+                out.append(d)
+        except Exception:
+            continue
+    return tuple(out)
+
+
 def _iso_from_ts(ts):
     if isinstance(ts, (int, float)):
         try:
@@ -44,7 +99,7 @@ def _iso_from_ts(ts):
         s = ts.strip()
         if not s:
             return ""
-        if re.fullmatch(r"\d{10,16}", s):
+        if _TS_DIGITS_RE.fullmatch(s):
             try:
                 n = int(s)
                 if n > 1_000_000_000_000:
@@ -81,18 +136,8 @@ def get_claude_cli_roots():
     if win_home:
         candidates.append(Path(win_home) / ".claude" / "projects")
 
-    users_root = Path("/mnt/c/Users")
-    if _path_exists_safe(users_root):
-        try:
-            dirs = list(users_root.iterdir())
-        except Exception:
-            dirs = []
-        for d in dirs:
-            try:
-                if d.is_dir():
-                    candidates.append(d / ".claude" / "projects")
-            except Exception:
-                continue
+    for d in _windows_user_dirs():
+        candidates.append(d / ".claude" / "projects")
 
     candidates = _unique_paths(candidates)
     existing = [p for p in candidates if _path_exists_safe(p)]
@@ -112,99 +157,172 @@ def get_claude_desktop_roots():
     if win_home:
         candidates.append(Path(win_home) / "AppData" / "Roaming" / "Claude" / "IndexedDB")
 
-    users_root = Path("/mnt/c/Users")
-    if _path_exists_safe(users_root):
-        try:
-            dirs = list(users_root.iterdir())
-        except Exception:
-            dirs = []
-        for d in dirs:
-            try:
-                if d.is_dir():
-                    candidates.append(d / "AppData" / "Roaming" / "Claude" / "IndexedDB")
-            except Exception:
-                continue
+    for d in _windows_user_dirs():
+        candidates.append(d / "AppData" / "Roaming" / "Claude" / "IndexedDB")
 
     candidates = _unique_paths(candidates)
     existing = [p for p in candidates if _path_exists_safe(p)]
     return existing if existing else candidates
 
 
-def get_roots():
-    return {
-        "claude_cli": get_claude_cli_roots(),
-        "claude_desktop": get_claude_desktop_roots(),
-    }
+_roots_lock = threading.Lock()
+_roots_cache = {"t": 0.0, "v": None, "allowed": None}
 
 
-def _iter_cli_jsonl_files(root: Path):
-    if not _path_exists_safe(root):
-        return []
-    try:
-        return [p for p in root.rglob("*.jsonl") if p.is_file()]
-    except Exception:
-        return []
+def _allowed_root_entry(root: Path):
+    resolved = os.path.normcase(str(root.resolve()))
+    prefix = resolved if resolved.endswith(os.sep) else resolved + os.sep
+    return root, resolved, prefix
 
 
-def _iter_desktop_leveldb_files(root: Path):
-    if not _path_exists_safe(root):
-        return []
+def find_allowed_root(path: Path):
+    # Plain string prefix checks against the precomputed roots; the trailing
+    # separator keeps /a/bc from matching root /a/b.
+    path_str = os.path.normcase(str(path))
+    for root, resolved, prefix in get_allowed_roots():
+        if path_str == resolved or path_str.startswith(prefix):
+            return root
+    return None
+
+
+def _roots_entry(refresh: bool = False):
+    with _roots_lock:
+        now = time.monotonic()
+        if not refresh and _roots_cache["v"] is not None and now - _roots_cache["t"] < ROOTS_CACHE_TTL:
+            return _roots_cache["v"], _roots_cache["allowed"]
+        # The user-profile listing is shared by both lookups below but must not
+        # outlive this rebuild, or profiles created later are never found.
+        _windows_user_dirs.cache_clear()
+        roots = {
+            "claude_cli": get_claude_cli_roots(),
+            "claude_desktop": get_claude_desktop_roots(),
+        }
+        # Resolved once per refresh so /api/session need not realpath every root per request.
+        allowed = [_allowed_root_entry(root) for root in roots["claude_cli"] + roots["claude_desktop"]]
+        _roots_cache.update(t=now, v=roots, allowed=allowed)
+        return roots, allowed
+
+
+def get_roots(refresh: bool = False):
+    return _roots_entry(refresh)[0]
+
+
+def get_allowed_roots():
+    return _roots_entry()[1]
+
+
+def _scan_files(root: Path, match_name):
+    # os.scandir hands back type info with each entry, so the walk needs no
+    # extra stat() per path; the one stat() kept per match feeds the mtime sort.
     out = []
-    patterns = ("*.ldb", "*.log", "MANIFEST-*")
-    for pat in patterns:
+    stack = [os.fspath(root)]
+    while stack:
+        current = stack.pop()
         try:
-            out.extend([p for p in root.rglob(pat) if p.is_file()])
-        except Exception:
+            with os.scandir(current) as it:
+                entries = list(it)
+        except OSError:
             continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif match_name(entry.name) and entry.is_file():
+                    out.append((Path(entry.path), entry.stat()))
+            except OSError:
+                continue
     return out
 
 
-def iter_all_session_files():
-    roots = get_roots()
-    files = []
+def _is_cli_session_name(name: str) -> bool:
+    return name.endswith(".jsonl")
+
+
+def _is_desktop_leveldb_name(name: str) -> bool:
+    return name.endswith((".ldb", ".log")) or name.startswith("MANIFEST-")
+
+
+def _iter_cli_jsonl_files(root: Path):
+    return _scan_files(root, _is_cli_session_name)
+
+
+def _iter_desktop_leveldb_files(root: Path):
+    return _scan_files(root, _is_desktop_leveldb_name)
+
+
+def iter_all_session_files(roots=None):
+    if roots is None:
+        roots = get_roots()
+    found = []
     for root in roots["claude_cli"]:
-        files.extend([("claude_cli", p, root) for p in _iter_cli_jsonl_files(root)])
+        found.extend([("claude_cli", p, root, st) for p, st in _iter_cli_jsonl_files(root)])
     for root in roots["claude_desktop"]:
-        files.extend([("claude_desktop", p, root) for p in _iter_desktop_leveldb_files(root)])
-    files.sort(key=lambda x: x[1].stat().st_mtime if x[1].exists() else 0, reverse=True)
-    return files
+        found.extend([("claude_desktop", p, root, st) for p, st in _iter_desktop_leveldb_files(root)])
+    found.sort(key=lambda x: x[3].st_mtime, reverse=True)
+    return found
+
+
+TEXT_KEYS = ("text", "content", "message", "prompt", "output", "input", "value", "body")
+SKIP_KEYS = frozenset(
+    (
+        "type",
+        "id",
+        "uuid",
+        "role",
+        "sender",
+        "author",
+        "version",
+        "updatedAt",
+        "createdAt",
+        "timestamp",
+        "time",
+        "ts",
+    )
+)
+NON_WALKED_KEYS = frozenset(TEXT_KEYS) | SKIP_KEYS
 
 
 def _extract_text_recursive(obj):
+    # Walks the tree with an explicit stack; children are pushed in reverse so
+    # texts come out in the same order as a depth-first recursive walk.
     texts = []
-    if isinstance(obj, str):
-        s = obj.strip()
-        if s:
-            texts.append(s)
-    elif isinstance(obj, list):
-        for item in obj:
-            texts.extend(_extract_text_recursive(item))
-    elif isinstance(obj, dict):
-        text_keys = ("text", "content", "message", "prompt", "output", "input", "value", "body")
-        for k in text_keys:
-            if k in obj:
-                texts.extend(_extract_text_recursive(obj.get(k)))
-        skip_keys = {
-            "type",
-            "id",
-            "uuid",
-            "role",
-            "sender",
-            "author",
-            "version",
-            "updatedAt",
-            "createdAt",
-            "timestamp",
-            "time",
-            "ts",
-        }
-        for k, v in obj.items():
-            if k in text_keys or k in skip_keys:
-                continue
-            texts.extend(_extract_text_recursive(v))
+    stack = [obj]
+    while stack:
+        cur = stack.pop()
+        if isinstance(cur, str):
+            s = cur.strip()
+            if s:
+                texts.append(s)
+        elif isinstance(cur, list):
+            stack.extend(reversed(cur))
+        elif isinstance(cur, dict):
+            children = [cur[k] for k in TEXT_KEYS if k in cur]
+            children.extend(v for k, v in cur.items() if k not in NON_WALKED_KEYS)
+            stack.extend(reversed(children))
     return texts
 
 
+ROLE_LABELS = {
+    "user": "user",
+    "human": "user",
+    "assistant": "assistant",
+    "claude": "assistant",
+    "ai": "assistant",
+    "developer": "developer",
+    "dev": "developer",
+    "system": "system",
+}
+TYPE_ROLE_LABELS = {
+    "user": "user",
+    "human_message": "user",
+    "human": "user",
+    "assistant": "assistant",
+    "assistant_message": "assistant",
+    "system": "system",
+    "system_message": "system",
+}
+
+
 def _guess_role(obj):
     if not isinstance(obj, dict):
         return "system"
@@ -212,39 +330,42 @@ def _guess_role(obj):
     if isinstance(msg, dict):
         msg_role = msg.get("role")
         if isinstance(msg_role, str):
-            low = msg_role.lower()
-            if low in ("user", "human"):
-                return "user"
-            if low in ("assistant", "claude", "ai"):
-                return "assistant"
-            if low in ("developer", "dev"):
-                return "developer"
-            if low == "system":
-                return "system"
+            role = ROLE_LABELS.get(msg_role.lower())
+            if role:
+                return role
     for key in ("role", "sender", "author"):
         val = obj.get(key)
         if isinstance(val, str):
-            low = val.lower()
-            if low in ("user", "human"):
-                return "user"
-            if low in ("assistant", "claude", "ai"):
-                return "assistant"
-            if low in ("developer", "dev"):
-                return "developer"
-            if low == "system":
-                return "system"
+            role = ROLE_LABELS.get(val.lower())
+            if role:
+                return role
     typ = obj.get("type")
     if isinstance(typ, str):
-        low = typ.lower()
-        if low in ("user", "human_message", "human"):
-            return "user"
-        if low in ("assistant", "assistant_message"):
-            return "assistant"
-        if low in ("system", "system_message"):
-            return "system"
+        role = TYPE_ROLE_LABELS.get(typ.lower())
+        if role:
+            return role
     return "system"
 
 
+def _is_plain_text_block(block):
+    return (
+        isinstance(block, dict)
+        and len(block) == 2
+        and block.get("type") == "text"
+        and isinstance(block.get("text"), str)
+    )
+
+
+def _extract_tool_result_text(content):
+    # tool_result content is nearly always a string or a list of plain text
+    # blocks; only other shapes need the generic tree walk.
+    if isinstance(content, str):
+        return content.strip()
+    if isinstance(content, list) and all(_is_plain_text_block(b) for b in content):
+        return "\n".join(t for t in (b["text"].strip() for b in content) if t)
+    return "\n".join(_extract_text_recursive(content))
+
+
 def _extract_claude_message_text(message_obj):
     if isinstance(message_obj, str):
         return message_obj.strip()
@@ -275,12 +396,12 @@ def _extract_claude_message_text(message_obj):
                 name = item.get("name", "")
                 tool_input = item.get("input")
                 if isinstance(tool_input, dict):
-                    arg = json.dumps(tool_input, ensure_ascii=False)
+                    arg = _json_dumps(tool_input)
                 else:
                     arg = str(tool_input or "")
                 chunks.append(f"[tool_use] {name} {arg}".strip())
             elif typ == "tool_result":
-                t = "\n".join(_extract_text_recursive(item.get("content")))
+                t = _extract_tool_result_text(item.get("content"))
                 if t.strip():
                     chunks.append(f"[tool_result] {t.strip()}")
             else:
@@ -308,7 +429,7 @@ def _extract_claude_progress_text(obj):
             f"hook_progress event={data.get('hookEvent','')} "
             f"name={data.get('hookName','')} command={data.get('command','')}"
         ).strip()
-    return json.dumps(data, ensure_ascii=False)
+    return _json_dumps(data)
 
 
 def _extract_ts_from_obj(obj):
@@ -335,7 +456,7 @@ def _to_windows_path_display(path_str: str) -> str:
     s = path_str.strip()
     if not s:
         return ""
-    m = re.match(r"^/mnt/([a-zA-Z])/(.*)$", s)
+    m = _WSL_PATH_RE.match(s)
     if m:
         drive = m.group(1).upper()
         rest = m.group(2).replace("/", "\\")
@@ -343,7 +464,7 @@ def _to_windows_path_display(path_str: str) -> str:
     converted = s.replace("/", "\\")
     # Some records can carry slug-like values such as "C:\\-foo-bar-baz".
     # Treat this as a project slug and normalize it into "C:\\foo\\bar\\baz".
-    m2 = re.match(r"^([a-zA-Z]:)\\-([^\\]+)$", converted)
+    m2 = _SLUG_WIN_RE.match(converted)
     if m2:
         drive = m2.group(1).upper()
         tail = "\\".join([p for p in m2.group(2).split("-") if p])
@@ -383,53 +504,60 @@ def _project_display_label(raw_project: str, cwd: str) -> str:
     return _decode_project_slug_to_windows_path(raw_project)
 
 
-def _is_probably_textual_json_line(line: str):
-    s = line.strip()
-    return s.startswith("{") and s.endswith("}")
+def _loads_json_line(line: bytes):
+    try:
+        if orjson is not None:
+            return orjson.loads(line)
+        return _json_decode(line.decode("utf-8"))
+    except ValueError:
+        # Invalid UTF-8 is replaced with U+FFFD, as the text-mode reader did,
+        # so such lines are kept rather than dropped.
+        return _json_decode(line.decode("utf-8", "replace"))
 
 
 def _extract_json_candidates_balanced(text: str, limit=200):
+    # Jumps between structural characters with compiled regexes instead of
+    # stepping through the text one character at a time in Python.
     out = []
-    n = len(text)
-    i = 0
-    while i < n and len(out) < limit:
-        if text[i] != "{":
-            i += 1
-            continue
-        start = i
+    i = text.find("{")
+    while i != -1 and len(out) < limit:
         depth = 0
         in_str = False
-        esc = False
+        end = -1
         j = i
-        while j < n:
+        while True:
+            m = (_JSON_STRING_SPECIAL_RE if in_str else _JSON_STRUCTURAL_RE).search(text, j)
+            if m is None:
+                break
+            j = m.start()
             ch = text[j]
             if in_str:
-                if esc:
-                    esc = False
-                elif ch == "\\":
-                    esc = True
-                elif ch == '"':
-                    in_str = False
+                if ch == "\\":
+                    j += 2
+                    continue
+                in_str = False
+            elif ch == '"':
+                in_str = True
+            elif ch == "{":
+                depth += 1
             else:
-                if ch == '"':
-                    in_str = True
-                elif ch == "{":
-                    depth += 1
-                elif ch == "}":
-                    depth -= 1
-                    if depth == 0:
-                        chunk = text[start : j + 1]
-                        if 24 <= len(chunk) <= 200_000:
-                            out.append(chunk)
-                        break
+                depth -= 1
+                if depth == 0:
+                    end = j
+                    break
             j += 1
-        i = j + 1 if j > i else i + 1
+        if end == -1:
+            break
+        if 24 <= end + 1 - i <= 200_000:
+            out.append(text[i : end + 1])
+        i = text.find("{", end + 1)
     return out
 
 
-def _extract_json_objects_from_text(text: str, limit=120):
+def _extract_json_objects_from_text(text: str, limit=120, seen=None):
     objs = []
-    seen = set()
+    if seen is None:
+        seen = set()
     for chunk in _extract_json_candidates_balanced(text, limit=limit * 6):
         if '"text"' not in chunk and '"content"' not in chunk and '"prompt"' not in chunk and '"message"' not in chunk:
             continue
@@ -438,7 +566,7 @@ def _extract_json_objects_from_text(text: str, limit=120):
             continue
         seen.add(key)
         try:
-            obj = json.loads(chunk)
+            obj = _json_decode(chunk)
         except Exception:
             continue
         if isinstance(obj, dict):
@@ -448,39 +576,38 @@ def _extract_json_objects_from_text(text: str, limit=120):
     return objs
 
 
+def _iter_decoded_texts(raw: bytes, need_json_keys=False):
+    # Decoded lazily so callers that hit their limit on the UTF-8 pass never
+    # pay for the UTF-16LE decode. The JSON pass can only match an object whose
+    # quoted key appears in the UTF-16LE decode, so it skips that decode when
+    # none of those key byte sequences occur in the blob.
+    yield str(raw, "utf-8", "ignore")
+    if not need_json_keys or _UTF16LE_JSON_KEY_RE.search(raw):
+        yield str(raw, "utf-16le", "ignore")
+
+
 def _extract_json_objects_from_bytes(raw: bytes, limit=120):
-    texts = [
-        raw.decode("utf-8", errors="ignore"),
-        raw.decode("utf-16le", errors="ignore"),
-    ]
+    # Both decodes share one seen-set keyed on the raw chunk text, so objects
+    # found twice are dropped without re-serializing them for comparison.
     out = []
     seen = set()
-    for text in texts:
+    for text in _iter_decoded_texts(raw, need_json_keys=True):
         if not text:
             continue
-        objs = _extract_json_objects_from_text(text, limit=limit)
-        for obj in objs:
-            sig = json.dumps(obj, ensure_ascii=False)[:400]
-            if sig in seen:
-                continue
-            seen.add(sig)
-            out.append(obj)
-            if len(out) >= limit:
-                return out
+        objs = _extract_json_objects_from_text(text, limit=limit, seen=seen)
+        out.extend(objs[: limit - len(out)])
+        if len(out) >= limit:
+            return out
     return out
 
 
 def _extract_readable_snippets(raw: bytes, limit=12):
     snippets = []
-    texts = [
-        raw.decode("utf-8", errors="ignore"),
-        raw.decode("utf-16le", errors="ignore"),
-    ]
     seen = set()
-    for text in texts:
+    for text in _iter_decoded_texts(raw):
         if not text:
             continue
-        for m in re.finditer(r"[ -~\u3040-\u30FF\u4E00-\u9FFF]{24,300}", text):
+        for m in _READABLE_RE.finditer(text):
             s = m.group(0).strip()
             if len(s) < 24:
                 continue
@@ -496,7 +623,43 @@ def _extract_readable_snippets(raw: bytes, limit=12):
     return snippets
 
 
-def summarize_cli_session(path: Path, root: Path):
+_blob_buffers = threading.local()
+
+
+def _blob_buffer():
+    buf = getattr(_blob_buffers, "buf", None)
+    if buf is None:
+        buf = bytearray(DESKTOP_BLOB_BUFFER_BYTES)
+        _blob_buffers.buf = buf
+    return buf
+
+
+@contextlib.contextmanager
+def _open_desktop_blob(path: Path, file_size=None):
+    # The blob is copied out and the file closed before parsing starts: Claude
+    # Desktop's LevelDB may want to delete or rename it meanwhile, which an open
+    # handle or a mapped view blocks on Windows. Small blobs reuse a per-thread
+    # buffer, so the yielded data is only valid inside the with-block.
+    view = None
+    with path.open("rb") as f:
+        if file_size is None:
+            file_size = os.fstat(f.fileno()).st_size
+        size = min(MAX_DESKTOP_SCAN_BYTES, file_size)
+        if size > DESKTOP_BLOB_BUFFER_BYTES:
+            data = f.read(size)
+        else:
+            view = memoryview(_blob_buffer())[:size]
+            n = f.readinto(view) if size else 0
+    if view is None:
+        yield data
+        return
+    with view, view[:n] as data:
+        yield data
+
+
+def summarize_cli_session(path: Path, root: Path, mtime=None):
+    if mtime is None:
+        mtime = path.stat().st_mtime
     summary = {
         "id": path.stem,
         "path": str(path),
@@ -504,7 +667,7 @@ def summarize_cli_session(path: Path, root: Path):
         "source": "Claude Code CLI",
         "source_type": "claude_cli",
         "project": "",
-        "mtime": datetime.fromtimestamp(path.stat().st_mtime).isoformat(),
+        "mtime": datetime.fromtimestamp(mtime).isoformat(),
         "started_at": "",
         "cwd": "",
         "model": "",
@@ -519,37 +682,44 @@ def summarize_cli_session(path: Path, root: Path):
         summary["project"] = rel.split("\\", 1)[0]
 
     search_chunks = []
+    search_len = 0
     search_limit = 2500
     try:
-        with path.open("r", encoding="utf-8", errors="replace") as f:
+        with path.open("rb") as f:
             for line in f:
-                if not _is_probably_textual_json_line(line):
-                    continue
                 try:
-                    obj = json.loads(line)
+                    obj = _loads_json_line(line)
                 except Exception:
                     continue
+                if not isinstance(obj, dict):
+                    continue
                 if not summary["started_at"]:
                     summary["started_at"] = _extract_ts_from_obj(obj)
                 if not summary["model"]:
                     for k in ("model", "model_name", "modelName"):
-                        v = obj.get(k) if isinstance(obj, dict) else None
+                        v = obj.get(k)
                         if isinstance(v, str) and v:
                             summary["model"] = v
                             break
                 if not summary["cwd"]:
-                    v = obj.get("cwd") if isinstance(obj, dict) else None
+                    v = obj.get("cwd")
                     if isinstance(v, str):
                         summary["cwd"] = v
                 role = _guess_role(obj)
+                if search_len >= search_limit and role != "user":
+                    # Only the first user message is still missing; other lines
+                    # cannot contribute anything more.
+                    continue
                 texts = _extract_text_recursive(obj)
                 if texts:
                     text = " ".join(texts).strip()
                     if role == "user" and not summary["first_user_text"]:
-                        summary["first_user_text"] = text.replace("\n", " ")[:180]
-                    if len(" ".join(search_chunks)) < search_limit:
-                        search_chunks.append(text.replace("\n", " ")[:320])
-                if summary["first_user_text"] and len(" ".join(search_chunks)) >= search_limit:
+                        summary["first_user_text"] = text[:180].replace("\n", " ")
+                    if search_len < search_limit:
+                        chunk = text[:320].replace("\n", " ")
+                        search_len += len(chunk) + (1 if search_chunks else 0)
+                        search_chunks.append(chunk)
+                if summary["first_user_text"] and search_len >= search_limit:
                     break
     except Exception:
         pass
@@ -559,7 +729,10 @@ def summarize_cli_session(path: Path, root: Path):
     return summary
 
 
-def summarize_desktop_blob(path: Path, root: Path):
+def summarize_desktop_blob(path: Path, root: Path, size=None, mtime=None):
+    if size is None or mtime is None:
+        st = path.stat()
+        size, mtime = st.st_size, st.st_mtime
     summary = {
         "id": path.name,
         "path": str(path),
@@ -567,7 +740,7 @@ def summarize_desktop_blob(path: Path, root: Path):
         "source": "Claude Desktop (IndexedDB/LevelDB)",
         "source_type": "claude_desktop",
         "project": "(desktop)",
-        "mtime": datetime.fromtimestamp(path.stat().st_mtime).isoformat(),
+        "mtime": datetime.fromtimestamp(mtime).isoformat(),
         "started_at": "",
         "cwd": "",
         "model": "",
@@ -576,12 +749,12 @@ def summarize_desktop_blob(path: Path, root: Path):
     }
 
     try:
-        with path.open("rb") as f:
-            raw = f.read(min(MAX_DESKTOP_SCAN_BYTES, max(256 * 1024, path.stat().st_size)))
+        with _open_desktop_blob(path, size) as raw:
+            objs = _extract_json_objects_from_bytes(raw, limit=40)
+            snippets = [] if objs else _extract_readable_snippets(raw, limit=10)
     except Exception:
         return summary
 
-    objs = _extract_json_objects_from_bytes(raw, limit=40)
     if objs:
         texts = []
         for obj in objs:
@@ -592,38 +765,101 @@ def summarize_desktop_blob(path: Path, root: Path):
             if parts:
                 merged = " ".join(parts).strip()
                 if role == "user" and not summary["first_user_text"]:
-                    summary["first_user_text"] = merged.replace("\n", " ")[:180]
-                texts.append(merged.replace("\n", " ")[:320])
+                    summary["first_user_text"] = merged[:180].replace("\n", " ")
+                texts.append(merged[:320].replace("\n", " "))
         summary["search_text"] = " ".join(texts[:20])
         if not summary["first_user_text"] and texts:
             summary["first_user_text"] = texts[0][:180]
     else:
-        snippets = _extract_readable_snippets(raw, limit=10)
         summary["search_text"] = " ".join(snippets)
         if snippets and not summary["first_user_text"]:
             summary["first_user_text"] = snippets[0][:180]
     return summary
 
 
-def summarize_session(source_type: str, path: Path, root: Path):
+def summarize_session(source_type: str, path: Path, root: Path, size=None, mtime=None):
+    # size/mtime come from a stat the caller already has; without them the
+    # summarizers stat the file themselves.
     if source_type == "claude_cli":
-        return summarize_cli_session(path, root)
-    return summarize_desktop_blob(path, root)
+        return summarize_cli_session(path, root, mtime)
+    return summarize_desktop_blob(path, root, size, mtime)
+
+
+@functools.lru_cache(maxsize=SUMMARY_CACHE_SIZE)
+def _summarize_cached(source_type: str, path_str: str, root_str: str, size: int, mtime_ns: int, mtime: float):
+    # size/mtime_ns key the entry: a rewritten file gets a new key, and stale
+    # entries age out of the LRU. mtime follows from mtime_ns and only saves
+    # the summarizers a second stat().
+    return summarize_session(source_type, Path(path_str), Path(root_str), size, mtime)
+
+
+def _summarize_item(item):
+    # Reuses the stat from the directory walk; the stat_result itself is not
+    # passed because its atime would leak into the cache key.
+    source_type, path, root, st = item
+    return _summarize_cached(source_type, str(path), str(root), st.st_size, st.st_mtime_ns, st.st_mtime)
+
+
+def iter_summaries(items):
+    # Executor.map yields results in input order as soon as each is ready,
+    # so callers can start streaming before the slowest summary finishes.
+    return _summary_executor.map(_summarize_item, items)
+
+
+# Fields the session list renders. search_text, the bulk of each summary, is
+# served separately by /api/search_index once a keyword filter needs it.
+LIST_FIELDS = (
+    "path",
+    "relative_path",
+    "project",
+    "source_type",
+    "started_at",
+    "mtime",
+    "first_user_text",
+)
+
+
+def project_list_fields(summary):
+    # Builds a new dict: summaries are shared lru_cache entries.
+    return {k: summary[k] for k in LIST_FIELDS if k in summary}
+
+
+# The items each fields=list response was built from, so /api/search_index
+# covers exactly the sessions that client loaded even if files were written
+# or re-sorted since. Only the most recent LIST_SNAPSHOTS are kept.
+_list_snapshots_lock = threading.Lock()
+_list_snapshots = {"next": 1, "items": {}}
+
+
+def save_list_snapshot(items) -> str:
+    with _list_snapshots_lock:
+        snapshot_id = str(_list_snapshots["next"])
+        _list_snapshots["next"] += 1
+        saved = _list_snapshots["items"]
+        saved[snapshot_id] = items
+        while len(saved) > LIST_SNAPSHOTS:
+            del saved[next(iter(saved))]
+        return snapshot_id
+
+
+def get_list_snapshot(snapshot_id: str):
+    with _list_snapshots_lock:
+        return _list_snapshots["items"].get(snapshot_id)
 
 
 def load_cli_events(path: Path):
     events = []
+    event_count = 0
     raw_count = 0
-    with path.open("r", encoding="utf-8", errors="replace") as f:
+    with path.open("rb") as f:
         for line in f:
             raw_count += 1
-            line = line.strip()
-            if not line:
-                continue
             try:
-                obj = json.loads(line)
+                obj = _loads_json_line(line)
             except Exception:
                 continue
+            if not isinstance(obj, dict):
+                continue
             ts = _extract_ts_from_obj(obj)
             typ = obj.get("type", "")
             role = _guess_role(obj)
@@ -651,26 +887,27 @@ def load_cli_events(path: Path):
             elif typ == "system":
                 kind = "system"
                 role = "system"
-                text = json.dumps(obj, ensure_ascii=False)
+                text = _json_dumps(obj)
             else:
                 text = _extract_claude_message_text(obj.get("message"))
                 if not text:
                     text = "\n".join(_extract_text_recursive(obj)).strip()
 
             if not text:
-                text = json.dumps(obj, ensure_ascii=False)[:1000]
+                text = _json_dumps(obj)[:1000]
             events.append({"timestamp": ts, "kind": kind, "role": role, "text": text})
-            if len(events) >= MAX_EVENTS:
+            event_count += 1
+            if event_count >= MAX_EVENTS:
                 break
     return {"events": events, "raw_line_count": raw_count}
 
 
 def load_desktop_events(path: Path):
     events = []
-    with path.open("rb") as f:
-        raw = f.read(min(MAX_DESKTOP_SCAN_BYTES, max(256 * 1024, path.stat().st_size)))
+    with _open_desktop_blob(path) as raw:
+        objs = _extract_json_objects_from_bytes(raw, limit=MAX_EVENTS)
+        snippets = [] if objs else _extract_readable_snippets(raw, limit=800)
 
-    objs = _extract_json_objects_from_bytes(raw, limit=MAX_EVENTS)
     if objs:
         for obj in objs:
             text = "\n".join(_extract_text_recursive(obj)).strip()
@@ -685,7 +922,7 @@ def load_desktop_events(path: Path):
                 }
             )
     else:
-        for s in _extract_readable_snippets(raw, limit=800):
+        for s in snippets:
             events.append({"timestamp": "", "kind": "snippet", "role": "system", "text": s})
 
     notice = (
@@ -795,9 +1032,9 @@ button {
   margin-top: 4px;
   display: flex;
   gap: 6px;
-  flex-wrap: wrap;
-  white-space: normal;
-  overflow: visible;
+  flex-wrap: nowrap;
+  white-space: nowrap;
+  overflow: hidden;
 }
 .session-project {
   color: #0b5f3d;
@@ -809,6 +1046,9 @@ button {
   padding: 1px 6px;
   display: inline-block;
   max-width: 100%;
+  min-width: 0;
+  overflow: hidden;
+  text-overflow: ellipsis;
 }
 .session-source {
   color: #5f3f0b;
@@ -821,6 +1061,7 @@ button {
   display: inline-block;
   max-width: 100%;
   margin-left: 6px;
+  flex-shrink: 0;
 }
 .session-source.cli {
   color: #0a3f8a;
@@ -843,11 +1084,19 @@ button {
   display: inline-block;
   max-width: 100%;
   margin-left: 6px;
+  flex-shrink: 0;
   font-variant-numeric: tabular-nums;
 }
 .session-preview {
   margin-top: 4px;
   font-size: 12px;
+  line-height: 1.4;
+  height: 2.8em;
+  overflow: hidden;
+  word-break: break-word;
+  display: -webkit-box;
+  -webkit-box-orient: vertical;
+  -webkit-line-clamp: 2;
   color: #34414f;
 }
 .right {
@@ -915,6 +1164,7 @@ button {
   padding: 14px;
   overflow: auto;
   flex: 1;
+  contain: content;
 }
 .ev {
   border: 1px solid var(--line);
@@ -1001,7 +1251,7 @@ pre {
       </select>
       <button id="reload">Reload</button>
     </div>
-    <div id="sessions"></div>
+    <div id="sessions"><div id="session_rows"></div></div>
   </aside>
   <main class="right">
     <div class="meta" id="meta">セッションを選択してください</div>
@@ -1013,6 +1263,17 @@ pre {
   </main>
 </div>
 <script>
+const FILTER_DEBOUNCE_MS = 150;
+const WS_RE = /\\s+/;
+const PATH_SEP_RUN_RE = /[\\\\/-]+/g;
+const SESSION_ROW_HEIGHT_GUESS = 90;
+const SESSION_OVERSCAN = 8;
+const QUERY_NORM_CACHE_MAX = 64;
+const SESSION_LOAD_BATCH = 200;
+const EVENT_CHUNK_THRESHOLD = 500;
+const EVENT_CHUNK_SIZE = 200;
+const SRC_CLI = 1;
+const SRC_DESKTOP = 2;
 const state = {
   sessions: [],
   filtered: [],
@@ -1020,21 +1281,48 @@ const state = {
   activeSession: null,
   activeEvents: [],
   activeRawLineCount: 0,
+  bySource: {[SRC_CLI]: [], [SRC_DESKTOP]: []},
+  sortedByTs: null,
+  sessionsVersion: 0,
+  searchIndex: null,
+  loadingSessions: [],
+  listSnapshot: null,
+  searchIndexLoadId: 0,
+  filterKey: null,
+  rowHeight: 0,
+  loadId: 0,
+  openAbort: null,
+  renderSeq: 0,
 };
 
-function esc(s){
-  return (s ?? '').toString().replace(/[&<>\"']/g, c => ({'&':'&amp;','<':'&lt;','>':'&gt;','\"':'&quot;',"'":'&#39;'}[c]));
-}
-
 function normalizePathForMatch(s){
+  // One pass: any run of slashes, backslashes and dashes becomes a single dash.
   return (s ?? '')
     .toString()
     .toLowerCase()
-    .replace(/[\\/]+/g, '-')
-    .replace(/-+/g, '-')
+    .replace(PATH_SEP_RUN_RE, '-')
     .trim();
 }
 
+function debounce(fn, ms){
+  let timer = null;
+  return (...args) => {
+    clearTimeout(timer);
+    timer = setTimeout(() => fn(...args), ms);
+  };
+}
+
+const queryNormCache = new Map();
+function normalizeQueryCached(s){
+  let norm = queryNormCache.get(s);
+  if(norm === undefined){
+    norm = normalizePathForMatch(s);
+    if(queryNormCache.size >= QUERY_NORM_CACHE_MAX) queryNormCache.delete(queryNormCache.keys().next().value);
+    queryNormCache.set(s, norm);
+  }
+  return norm;
+}
+
 function fmt(ts){
   if(!ts) return '';
   const d = new Date(ts);
@@ -1059,13 +1347,148 @@ function parseOptionalDateEnd(raw){
   return Number.isNaN(ts) ? null : ts;
 }
 
-async function loadSessions(){
-  const r = await fetch('/api/sessions');
-  const data = await r.json();
-  state.sessions = data.sessions;
-  document.getElementById('roots').textContent =
-    `CLI roots: ${data.roots.claude_cli.join(', ') || '-'} | Desktop roots: ${data.roots.claude_desktop.join(', ') || '-'}`;
-  applyFilter();
+function isAsciiLower(s){
+  for(let i = 0; i < s.length; i++){
+    const c = s.charCodeAt(i);
+    if(c > 127 || (c >= 65 && c <= 90)) return false;
+  }
+  return true;
+}
+
+function toLowerFast(s){
+  // Most paths and texts are already ASCII lowercase; skip the allocation.
+  return isAsciiLower(s) ? s : s.toLowerCase();
+}
+
+function indexSearchText(s){
+  if(state.searchIndex) s.search_text = state.searchIndex.get(s.path) ?? s.search_text;
+  s._searchLc = toLowerFast(
+    (s.relative_path || '') + ' ' +
+    (s.project || '') + ' ' +
+    (s.first_user_text || '') + ' ' +
+    (s.search_text || '')
+  );
+}
+
+function requestSearchIndex(){
+  // The list is loaded without search_text; it is fetched once per load, the
+  // first time a keyword filter runs, for the server-side snapshot of that
+  // load's list, and merged into the loaded sessions. Until the list header
+  // names the snapshot, the next flush's applyFilter retries.
+  if(state.searchIndexLoadId === state.loadId || !state.listSnapshot) return;
+  const loadId = state.searchIndexLoadId = state.loadId;
+  fetch('/api/search_index?snapshot=' + encodeURIComponent(state.listSnapshot))
+    .then(r => r.json())
+    .then(data => {
+      if(loadId !== state.loadId) return;
+      if(data.error){
+        // The server no longer has this list (restarted, or many loads since).
+        loadSessions();
+        return;
+      }
+      state.searchIndex = new Map(Object.entries(data.search_text || {}));
+      // Rows a load has streamed in but not yet swapped into state.sessions
+      // were indexed without the texts, so they are redone as well.
+      for(const s of state.sessions) indexSearchText(s);
+      if(state.loadingSessions !== state.sessions){
+        for(const s of state.loadingSessions) indexSearchText(s);
+      }
+      state.sessionsVersion++;
+      applyFilter();
+    })
+    .catch(() => {
+      if(state.searchIndexLoadId === loadId) state.searchIndexLoadId = 0;
+    });
+}
+
+function indexSession(s){
+  // Lowercased match targets and the numeric timestamp are built once per
+  // load instead of per keystroke.
+  s._projectLc = toLowerFast((s.project || '') + ' ' + (s.relative_path || ''));
+  s._projectLcNorm = normalizePathForMatch(s._projectLc);
+  indexSearchText(s);
+  s._ts = toTimestamp(s.started_at || s.mtime);
+  s._srcId = s.source_type === 'claude_cli' ? SRC_CLI : SRC_DESKTOP;
+  s._srcClass = s._srcId === SRC_CLI ? 'session-source cli' : 'session-source desktop';
+  s._srcLabel = s._srcId === SRC_CLI ? 'CLI(JSONL)' : 'Desktop(LevelDB)';
+  return s;
+}
+
+async function readNdjson(response, onItem){
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buf = '';
+  for(;;){
+    const {done, value} = await reader.read();
+    buf += done ? decoder.decode() : decoder.decode(value, {stream: true});
+    const lines = buf.split('\\n');
+    buf = lines.pop();
+    for(const line of lines){
+      if(line) onItem(JSON.parse(line));
+    }
+    if(done) break;
+  }
+  if(buf) onItem(JSON.parse(buf));
+}
+
+async function loadSessions(refresh){
+  const loadId = ++state.loadId;
+  state.searchIndex = null;
+  state.listSnapshot = null;
+  const sessions = state.loadingSessions = [];
+  const r = await fetch(refresh ? '/api/sessions?fields=list&refresh=1' : '/api/sessions?fields=list');
+  const bySource = {[SRC_CLI]: [], [SRC_DESKTOP]: []};
+  let header = null;
+  let pending = 0;
+  // Swap the new arrays in on the first batch so the old list stays visible until then.
+  const flush = () => {
+    if(loadId !== state.loadId) return;
+    pending = 0;
+    state.sessions = sessions;
+    state.bySource = bySource;
+    state.sortedByTs = null;
+    state.sessionsVersion++;
+    applyFilter();
+  };
+  await readNdjson(r, (item) => {
+    if(loadId !== state.loadId) return;
+    if(!header){
+      header = item;
+      state.listSnapshot = header.snapshot || null;
+      document.getElementById('roots').textContent =
+        `CLI roots: ${header.roots.claude_cli.join(', ') || '-'} | Desktop roots: ${header.roots.claude_desktop.join(', ') || '-'}`;
+      return;
+    }
+    const s = indexSession(item);
+    s._idx = sessions.length;
+    sessions.push(s);
+    bySource[s._srcId].push(s);
+    if(++pending >= SESSION_LOAD_BATCH) flush();
+  });
+  flush();
+}
+
+function buildSortedByTs(sessions){
+  // Sessions without a timestamp never pass a date filter, so they are left out.
+  return sessions.filter(s => !Number.isNaN(s._ts)).sort((a, b) => a._ts - b._ts);
+}
+
+function lowerBoundTs(sorted, ts){
+  let lo = 0, hi = sorted.length;
+  while(lo < hi){
+    const mid = (lo + hi) >>> 1;
+    if(sorted[mid]._ts < ts) lo = mid + 1; else hi = mid;
+  }
+  return lo;
+}
+
+function upperBoundTs(sorted, ts){
+  let lo = 0, hi = sorted.length;
+  while(lo < hi){
+    const mid = (lo + hi) >>> 1;
+    if(sorted[mid]._ts <= ts) lo = mid + 1; else hi = mid;
+  }
+  return lo;
 }
 
 function applyFilter(){
@@ -1074,66 +1497,137 @@ function applyFilter(){
   const fromRaw = document.getElementById('date_from').value;
   const toRaw = document.getElementById('date_to').value;
   const sourceFilter = document.getElementById('source_filter').value;
+  const mode = document.getElementById('mode').value;
+  // Input events also fire for edits that leave the filter unchanged; skip
+  // the scan unless the inputs or the loaded sessions actually changed.
+  const filterKey = [state.sessionsVersion, projectQ, q, fromRaw, toRaw, sourceFilter, mode].join('\\u0000');
+  if(filterKey === state.filterKey) return;
+  state.filterKey = filterKey;
+  const srcIdFilter = sourceFilter === 'claude_cli' ? SRC_CLI : sourceFilter === 'claude_desktop' ? SRC_DESKTOP : 0;
   const fromTs = parseOptionalDateStart(fromRaw);
   const toTs = parseOptionalDateEnd(toRaw);
-  const mode = document.getElementById('mode').value;
-  const terms = q.split(new RegExp('\\s+')).filter(Boolean);
-
-  state.filtered = state.sessions.filter(s => {
-    const projectTarget = ((s.project || '') + ' ' + (s.relative_path || '')).toLowerCase();
-    const projectTargetNorm = normalizePathForMatch(projectTarget);
-    const projectQNorm = normalizePathForMatch(projectQ);
-    const projectMatched =
-      !projectQ ||
-      projectTarget.includes(projectQ) ||
-      (projectQNorm && projectTargetNorm.includes(projectQNorm));
-    const sourceMatched = !sourceFilter || s.source_type === sourceFilter;
-
-    let dateMatched = true;
-    if(fromTs !== null || toTs !== null){
-      const sessionTs = toTimestamp(s.started_at || s.mtime);
-      if(Number.isNaN(sessionTs)){
-        dateMatched = false;
-      } else {
-        if(fromTs !== null && sessionTs < fromTs) dateMatched = false;
-        if(toTs !== null && sessionTs > toTs) dateMatched = false;
-      }
-    }
+  const hasDateFilter = fromTs !== null || toTs !== null;
+  const projectQNorm = projectQ ? normalizeQueryCached(projectQ) : '';
+  const terms = q ? q.split(WS_RE).filter(Boolean) : [];
+  const matchKeywords = terms.length === 0
+    ? null
+    : (mode === 'or'
+      ? target => terms.some(t => target.includes(t))
+      : target => terms.every(t => target.includes(t)));
+  if(matchKeywords) requestSearchIndex();
+
+  // A date range is cut out of the timestamp-sorted index by binary search;
+  // otherwise the source filter selects a prebuilt bucket. The remaining
+  // gates run cheapest first so most sessions are rejected before any
+  // substring search.
+  let pool;
+  let checkSource = false;
+  if(hasDateFilter){
+    const sorted = state.sortedByTs ||= buildSortedByTs(state.sessions);
+    const lo = fromTs === null ? 0 : lowerBoundTs(sorted, fromTs);
+    const hi = toTs === null ? sorted.length : upperBoundTs(sorted, toTs);
+    pool = sorted.slice(lo, hi);
+    checkSource = srcIdFilter !== 0;
+  }else{
+    pool = srcIdFilter ? state.bySource[srcIdFilter] : state.sessions;
+  }
+  const filtered = pool.filter(s => {
+    if(checkSource && s._srcId !== srcIdFilter) return false;
 
-    let keywordMatched = true;
-    if(terms.length > 0){
-      const target = (
-        (s.relative_path || '') + ' ' +
-        (s.project || '') + ' ' +
-        (s.first_user_text || '') + ' ' +
-        (s.search_text || '')
-      ).toLowerCase();
-      if(mode === 'or'){
-        keywordMatched = terms.some(t => target.includes(t));
-      } else {
-        keywordMatched = terms.every(t => target.includes(t));
-      }
+    if(projectQ && !s._projectLc.includes(projectQ)){
+      if(!projectQNorm || !s._projectLcNorm.includes(projectQNorm)) return false;
     }
-    return projectMatched && sourceMatched && dateMatched && keywordMatched;
+
+    if(matchKeywords && !matchKeywords(s._searchLc)) return false;
+    return true;
   });
+  // The date slice is in timestamp order; put matches back in list order.
+  if(hasDateFilter) filtered.sort((a, b) => a._idx - b._idx);
+  state.filtered = filtered;
   renderSessionList();
 }
 
+function createEl(tag, className, text){
+  const node = document.createElement(tag);
+  if(className) node.className = className;
+  if(text !== undefined) node.textContent = text;
+  return node;
+}
+
+function createSessionRow(){
+  const row = createEl('div', 'session-item');
+  const tags = createEl('div', 'session-tags');
+  row._refs = {
+    path: createEl('div', 'session-path'),
+    preview: createEl('div', 'session-preview'),
+    project: createEl('span', 'session-project'),
+    source: createEl('span', 'session-source'),
+    time: createEl('span', 'session-time'),
+  };
+  tags.append(row._refs.project, row._refs.source, row._refs.time);
+  row.append(row._refs.path, row._refs.preview, tags);
+  return row;
+}
+
+function updateSessionRow(row, s){
+  const refs = row._refs;
+  row.classList.toggle('active', state.activePath === s.path);
+  row.dataset.path = s.path;
+  row.dataset.source = s.source_type;
+  refs.path.textContent = s.relative_path || '';
+  refs.preview.textContent = s.first_user_text || '(previewなし)';
+  refs.project.textContent = `project: ${s.project || '-'}`;
+  refs.source.className = s._srcClass;
+  refs.source.textContent = s._srcLabel;
+  refs.time.textContent = fmt(s.started_at || s.mtime);
+}
+
+function fillSessionRows(list, start, end){
+  // Existing rows are reused and only their text is updated; rows are added
+  // or removed only when the window size changes.
+  const count = end - start;
+  while(list.childElementCount > count) list.removeChild(list.lastChild);
+  const reused = list.childElementCount;
+  for(let i = 0; i < reused; i++) updateSessionRow(list.children[i], state.filtered[start + i]);
+  if(reused < count){
+    const frag = document.createDocumentFragment();
+    for(let i = reused; i < count; i++){
+      const row = createSessionRow();
+      updateSessionRow(row, state.filtered[start + i]);
+      frag.appendChild(row);
+    }
+    list.appendChild(frag);
+  }
+}
+
 function renderSessionList(){
+  // Only the rows in (or near) the viewport exist in the DOM; padding on the
+  // row container stands in for the rest so the scrollbar stays accurate.
   const box = document.getElementById('sessions');
-  box.innerHTML = state.filtered.map(s => `
-    <div class="session-item ${state.activePath === s.path ? 'active' : ''}" data-path="${esc(s.path)}" data-source="${esc(s.source_type)}">
-      <div class="session-path">${esc(s.relative_path)}</div>
-      <div class="session-preview">${esc(s.first_user_text || '(previewなし)')}</div>
-      <div class="session-tags">
-        <span class="session-project">project: ${esc(s.project || '-')}</span>
-        <span class="session-source ${s.source_type === 'claude_cli' ? 'cli' : 'desktop'}">${s.source_type === 'claude_cli' ? 'CLI(JSONL)' : 'Desktop(LevelDB)'}</span>
-        <span class="session-time">${esc(fmt(s.started_at || s.mtime))}</span>
-      </div>
-    </div>
-  `).join('');
-  box.querySelectorAll('.session-item').forEach(el => {
-    el.onclick = () => openSession(el.dataset.path, el.dataset.source);
+  const list = document.getElementById('session_rows');
+  const total = state.filtered.length;
+  const rowHeight = state.rowHeight || SESSION_ROW_HEIGHT_GUESS;
+  const visible = Math.ceil(box.clientHeight / rowHeight) + 1;
+  const first = Math.min(Math.floor(box.scrollTop / rowHeight), total - visible);
+  const start = Math.max(0, first - SESSION_OVERSCAN);
+  const end = Math.min(total, start + visible + 2 * SESSION_OVERSCAN);
+  list.style.paddingTop = `${start * rowHeight}px`;
+  list.style.paddingBottom = `${(total - end) * rowHeight}px`;
+  fillSessionRows(list, start, end);
+
+  const measured = list.firstChild ? list.firstChild.getBoundingClientRect().height : 0;
+  if(measured && measured !== state.rowHeight){
+    state.rowHeight = measured;
+    renderSessionList();
+  }
+}
+
+let sessionScrollFrame = 0;
+function scheduleSessionListRender(){
+  if(sessionScrollFrame) return;
+  sessionScrollFrame = requestAnimationFrame(() => {
+    sessionScrollFrame = 0;
+    renderSessionList();
   });
 }
 
@@ -1148,9 +1642,21 @@ function getDisplayEvents(){
   return events;
 }
 
+function createEventNode(ev){
+  const role = ev.role || 'system';
+  const kind = ev.kind || 'event';
+  const safeKind = String(kind).replace(/[^a-zA-Z0-9_-]/g, '-').toLowerCase();
+  const node = createEl('div', `ev ${role} kind-${safeKind}`);
+  const head = createEl('div', 'ev-head');
+  head.append(createEl('span', '', kind), createEl('span', `ev-role ${role}`, role), createEl('span', '', fmt(ev.timestamp)));
+  node.append(head, createEl('pre', '', ev.text || ''));
+  return node;
+}
+
 function renderActiveSession(){
   const meta = document.getElementById('meta');
   const eventsBox = document.getElementById('events');
+  const seq = ++state.renderSeq;
   if(!state.activeSession){
     meta.textContent = 'セッションを選択してください';
     eventsBox.innerHTML = '';
@@ -1158,28 +1664,63 @@ function renderActiveSession(){
   }
 
   const displayEvents = getDisplayEvents();
-  const sourceType = state.activeSession.source_type || '';
-  const sourceClass = sourceType === 'claude_cli' ? 'cli' : 'desktop';
-  meta.innerHTML =
-    `source: <code class="source-code ${sourceClass}">${esc(state.activeSession.source)}</code> | path: <code class="path-code">${esc(state.activeSession.relative_path)}</code> | ` +
-    `project: <code class="project-code">${esc(state.activeSession.project || '-')}</code> | ` +
-    `events: ${displayEvents.length}/${state.activeEvents.length} | raw lines/snippets: ${state.activeRawLineCount}`;
-
-  eventsBox.innerHTML = displayEvents.map(ev => {
-    const role = ev.role || 'system';
-    const kind = ev.kind || 'event';
-    const safeKind = String(kind).replace(/[^a-zA-Z0-9_-]/g, '-').toLowerCase();
-    const body = `<pre>${esc(ev.text || '')}</pre>`;
-    return `<div class="ev ${role} kind-${safeKind}"><div class="ev-head"><span>${esc(kind)}</span><span class="ev-role ${esc(role)}">${esc(role)}</span><span>${esc(fmt(ev.timestamp))}</span></div>${body}</div>`;
-  }).join('');
+  const session = state.activeSession;
+  const sourceClass = session.source_type === 'claude_cli' ? 'cli' : 'desktop';
+  const metaNodes = [
+    'source: ', createEl('code', `source-code ${sourceClass}`, session.source ?? ''),
+    ' | path: ', createEl('code', 'path-code', session.relative_path ?? ''),
+    ' | project: ', createEl('code', 'project-code', session.project || '-'),
+    ` | events: ${displayEvents.length}/${state.activeEvents.length} | raw lines/snippets: ${state.activeRawLineCount}`,
+  ];
+
+  // DOM writes happen in animation frames; long sessions are appended a chunk
+  // per frame so input stays responsive. A newer render drops pending chunks.
+  const total = displayEvents.length;
+  const chunk = total > EVENT_CHUNK_THRESHOLD ? EVENT_CHUNK_SIZE : total;
+  const writeEvents = (start) => {
+    if(seq !== state.renderSeq) return;
+    const end = Math.min(total, start + chunk);
+    const frag = document.createDocumentFragment();
+    for(let i = start; i < end; i++) frag.appendChild(createEventNode(displayEvents[i]));
+    if(start === 0){
+      meta.replaceChildren(...metaNodes);
+      eventsBox.replaceChildren(frag);
+    }else{
+      eventsBox.appendChild(frag);
+    }
+    if(end < total) requestAnimationFrame(() => writeEvents(end));
+  };
+  requestAnimationFrame(() => writeEvents(0));
+}
+
+function markActiveRow(){
+  // Only the rendered window can hold the active row; rows scrolled in later
+  // get their class from updateSessionRow().
+  for(const row of document.getElementById('session_rows').children){
+    row.classList.toggle('active', row.dataset.path === state.activePath);
+  }
 }
 
 async function openSession(path, sourceType){
   state.activePath = path;
-  renderSessionList();
-  const r = await fetch('/api/session?path=' + encodeURIComponent(path) + '&source=' + encodeURIComponent(sourceType || ''));
-  const data = await r.json();
+  markActiveRow();
+  // A newer click cancels the previous request so a late response cannot
+  // overwrite the session the user is now looking at.
+  state.openAbort?.abort();
+  const abort = state.openAbort = new AbortController();
+  let data;
+  try{
+    const r = await fetch(
+      '/api/session?path=' + encodeURIComponent(path) + '&source=' + encodeURIComponent(sourceType || ''),
+      {signal: abort.signal},
+    );
+    data = await r.json();
+  }catch(err){
+    if(err.name === 'AbortError') return;
+    throw err;
+  }
   if(data.error){
+    state.renderSeq++;
     state.activeSession = null;
     state.activeEvents = [];
     state.activeRawLineCount = 0;
@@ -1193,13 +1734,20 @@ async function openSession(path, sourceType){
   renderActiveSession();
 }
 
-document.getElementById('project_q').addEventListener('input', applyFilter);
+const applyFilterDebounced = debounce(applyFilter, FILTER_DEBOUNCE_MS);
+document.getElementById('project_q').addEventListener('input', applyFilterDebounced);
 document.getElementById('date_from').addEventListener('change', applyFilter);
 document.getElementById('date_to').addEventListener('change', applyFilter);
-document.getElementById('q').addEventListener('input', applyFilter);
+document.getElementById('q').addEventListener('input', applyFilterDebounced);
 document.getElementById('source_filter').addEventListener('change', applyFilter);
 document.getElementById('mode').addEventListener('change', applyFilter);
-document.getElementById('reload').addEventListener('click', loadSessions);
+document.getElementById('reload').addEventListener('click', () => loadSessions(true));
+document.getElementById('sessions').addEventListener('scroll', scheduleSessionListRender);
+window.addEventListener('resize', scheduleSessionListRender);
+document.getElementById('sessions').addEventListener('click', e => {
+  const row = e.target.closest('.session-item');
+  if(row) openSession(row.dataset.path, row.dataset.source);
+});
 document.getElementById('only_user_instruction').addEventListener('change', renderActiveSession);
 document.getElementById('reverse_order').addEventListener('change', renderActiveSession);
 loadSessions();
@@ -1210,14 +1758,51 @@ loadSessions();
 
 
 class Handler(BaseHTTPRequestHandler):
+    # Idle or stalled connections give their pool worker back after this.
+    timeout = HTTP_REQUEST_TIMEOUT
+
+    def _accepts_gzip(self):
+        return "gzip" in self.headers.get("Accept-Encoding", "")
+
     def _send_json(self, data, status=200):
-        raw = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        raw = _json_dumps_compact(data).encode("utf-8")
+        gzipped = len(raw) > GZIP_MIN_BYTES and self._accepts_gzip()
+        if gzipped:
+            raw = gzip.compress(raw, GZIP_LEVEL)
         self.send_response(status)
         self.send_header("Content-Type", "application/json; charset=utf-8")
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
         self.send_header("Content-Length", str(len(raw)))
         self.end_headers()
         self.wfile.write(raw)
 
+    def _send_ndjson(self, header, rows, status=200):
+        # No Content-Length: the HTTP/1.0 connection close ends the body.
+        # A gzip stream is sync-flushed per batch so the client can still
+        # decode and render each batch as it arrives.
+        z = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31) if self._accepts_gzip() else None
+        self.send_response(status)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        if z is not None:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+
+        def write(lines, final=False):
+            raw = ("\n".join(lines) + "\n").encode("utf-8") if lines else b""
+            if z is not None:
+                raw = z.compress(raw) + z.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+            if raw:
+                self.wfile.write(raw)
+
+        buf = [_json_dumps_compact(header)]
+        for row in rows:
+            buf.append(_json_dumps_compact(row))
+            if len(buf) >= NDJSON_FLUSH_LINES:
+                write(buf)
+                buf = []
+        write(buf, final=True)
+
     def _send_html(self, text, status=200):
         raw = text.encode("utf-8")
         self.send_response(status)
@@ -1236,18 +1821,29 @@ class Handler(BaseHTTPRequestHandler):
             return
 
         if parsed.path == "/api/sessions":
-            roots = get_roots()
-            items = iter_all_session_files()[:MAX_LIST]
-            sessions = [summarize_session(source_type, path, root) for source_type, path, root in items]
-            self._send_json(
-                {
-                    "roots": {
-                        "claude_cli": [str(x) for x in roots["claude_cli"]],
-                        "claude_desktop": [str(x) for x in roots["claude_desktop"]],
-                    },
-                    "sessions": sessions,
+            q = urllib.parse.parse_qs(parsed.query)
+            roots = get_roots(refresh=q.get("refresh", [""])[0] == "1")
+            items = iter_all_session_files(roots)[:MAX_LIST]
+            header = {
+                "roots": {
+                    "claude_cli": [str(x) for x in roots["claude_cli"]],
+                    "claude_desktop": [str(x) for x in roots["claude_desktop"]],
                 }
-            )
+            }
+            sessions = iter_summaries(items)
+            if q.get("fields", [""])[0] == "list":
+                sessions = map(project_list_fields, sessions)
+                header["snapshot"] = save_list_snapshot(items)
+            self._send_ndjson(header, sessions)
+            return
+
+        if parsed.path == "/api/search_index":
+            q = urllib.parse.parse_qs(parsed.query)
+            items = get_list_snapshot(q.get("snapshot", [""])[0])
+            if items is None:
+                self._send_json({"error": "list snapshot expired"}, 404)
+                return
+            self._send_json({"search_text": {s["path"]: s["search_text"] for s in iter_summaries(items)}})
             return
 
         if parsed.path == "/api/session":
@@ -1258,19 +1854,11 @@ class Handler(BaseHTTPRequestHandler):
                 self._send_json({"error": "path is required"}, 400)
                 return
             p = Path(raw_path).expanduser().resolve()
-            roots = get_roots()
-            allowed_roots = roots["claude_cli"] + roots["claude_desktop"]
             if source_type not in ("claude_cli", "claude_desktop"):
-                source_type = "claude_cli" if any("projects" in str(r).lower() for r in allowed_roots) else "claude_desktop"
+                allowed_roots = get_allowed_roots()
+                source_type = "claude_cli" if any("projects" in str(r[0]).lower() for r in allowed_roots) else "claude_desktop"
 
-            chosen_root = None
-            for root in allowed_roots:
-                try:
-                    p.relative_to(root.resolve())
-                    chosen_root = root
-                    break
-                except Exception:
-                    continue
+            chosen_root = find_allowed_root(p)
             if chosen_root is None:
                 self._send_json({"error": "path is outside allowed roots"}, 400)
                 return
@@ -1287,8 +1875,45 @@ class Handler(BaseHTTPRequestHandler):
         self._send_html("<h1>404</h1>", 404)
 
 
+class PooledHTTPServer(HTTPServer):
+    # Serves requests on a bounded pool of reused worker threads instead of
+    # starting a new thread per request like ThreadingHTTPServer. Workers are
+    # daemon threads, as ThreadingHTTPServer's are, so Ctrl+C is not held up
+    # by a connection still in progress.
+    def __init__(self, server_address, handler_class, pool_size=HTTP_POOL_SIZE):
+        super().__init__(server_address, handler_class)
+        self._requests = queue.SimpleQueue()
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"http_{i}", daemon=True)
+            for i in range(max(1, pool_size))
+        ]
+        for t in self._workers:
+            t.start()
+
+    def process_request(self, request, client_address):
+        self._requests.put((request, client_address))
+
+    def _worker(self):
+        while True:
+            item = self._requests.get()
+            if item is None:
+                return
+            request, client_address = item
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        for _ in self._workers:
+            self._requests.put(None)
+
+
 def main():
-    server = ThreadingHTTPServer((HOST, PORT), Handler)
+    server = PooledHTTPServer((HOST, PORT), Handler)
     print(f"Viewer: http://{HOST}:{PORT}")
     print("Claude Code CLI roots:")
     for p in get_claude_cli_roots():